@@ -1,12 +1,33 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import os
 from src.data_loader import DataLoader
 from src.analysis import Analyzer
 
+
+# Heavy analyses are cached on the merged data, so widget interactions (which
+# rerun the whole script) reuse the results instead of recomputing them. Each
+# works on a copy because Analyzer adds columns to the frame it is given.
+@st.cache_data(show_spinner="🔄 Segmenting traders...")
+def run_trader_analysis(merged_df, include_risk):
+    analyzer = Analyzer(merged_df.copy())
+    # segment_traders relies on the 'win' column derived here
+    analyzer.calculate_metrics()
+    return analyzer.segment_traders(include_risk=include_risk), analyzer.risk_features()
+
+
+@st.cache_data(show_spinner="🔄 Correlating sentiment with trading...")
+def run_lag_analysis(merged_df, max_lag):
+    # Both results come from one SentimentLagAnalysis on the same Analyzer
+    analyzer = Analyzer(merged_df.copy())
+    return analyzer.sentiment_lag_profile(max_lag=max_lag), analyzer.sentiment_sensitive_traders(max_lag=max_lag, top=20)
+
+
+@st.cache_data(show_spinner="🔄 Backtesting rule variants...")
+def run_backtest(merged_df):
+    return Analyzer(merged_df.copy()).backtest_strategies()
+
+
 # Page Configuration
 st.set_page_config(
     page_title="Market Sentiment Analysis Dashboard",
@@ -174,17 +195,17 @@ with st.sidebar:
     st.markdown("#### 📈 Sentiment Data")
     sentiment_file = st.file_uploader(
         "Upload sentiment CSV file",
-        type=['csv'],
+        type=['csv', 'gz', 'zst', 'zip', 'parquet'],
         key="sentiment",
-        help="Upload a CSV file containing market sentiment data"
+        help="Upload a CSV (optionally gzip/zstd/zip compressed) or Parquet file containing market sentiment data"
     )
     
     st.markdown("#### 💹 Trading Data")
     trades_file = st.file_uploader(
         "Upload trades CSV file",
-        type=['csv'],
+        type=['csv', 'gz', 'zst', 'zip', 'parquet'],
         key="trades",
-        help="Upload a CSV file containing trading data"
+        help="Upload a CSV (optionally gzip/zstd/zip compressed) or Parquet file containing trading data"
     )
     
     st.markdown("---")
@@ -203,14 +224,19 @@ local_trades = 'data/trades.csv'
 local_data_exists = os.path.exists(local_sentiment) and os.path.exists(local_trades)
 
 if (sentiment_file and trades_file) or local_data_exists:
+    # Plotly is only needed once there is data to chart, so the welcome screen skips it
+    import plotly.express as px
+
     try:
         with st.spinner('🔄 Loading and processing data...'):
             if sentiment_file and trades_file:
                 loader = DataLoader(sentiment_file, trades_file)
-                sentiment_df, trades_df, merged_df = loader.preprocess_data(
-                    pd.read_csv(sentiment_file), 
-                    pd.read_csv(trades_file)
+                upload_progress = st.progress(0.0, text="📥 Reading uploads...")
+                s_df, t_df = loader.load_uploads(
+                    progress=lambda fraction: upload_progress.progress(fraction, text=f"📥 Reading uploads... {fraction:.0%}")
                 )
+                upload_progress.empty()
+                sentiment_df, trades_df, merged_df = loader.preprocess_data(s_df, t_df)
             elif local_data_exists:
                 st.info("📂 No files uploaded. Using local files from 'data/' folder.")
                 loader = DataLoader(local_sentiment, local_trades)
@@ -429,11 +455,43 @@ if (sentiment_file and trades_file) or local_data_exists:
                             )
                 else:
                     st.warning("⚠️ No valid leverage data available after cleaning.")
+            
+            # Lead/lag between the numeric Fear & Greed value and trading outcomes
+            if 'Value' in merged_df.columns:
+                st.markdown("#### ⏱️ Sentiment Lead/Lag Analysis")
+                st.caption("Correlation of the daily Fear & Greed value (and its daily change) with trading metrics k days later. Positive lags mean sentiment leads.")
+                
+                lag_profile, sensitive_traders = run_lag_analysis(merged_df, 7)
+                fig_lag = px.line(
+                    lag_profile,
+                    x='lag',
+                    y='correlation',
+                    color='metric',
+                    facet_col='signal',
+                    markers=True,
+                    title="Sentiment Lag Profile (All Traders)"
+                )
+                fig_lag.update_layout(
+                    xaxis_title="Lag (days)",
+                    yaxis_title="Correlation",
+                    height=400
+                )
+                st.plotly_chart(fig_lag, width='stretch')
+                
+                st.markdown("##### 🎯 Most Sentiment-Sensitive Traders")
+                st.dataframe(
+                    sensitive_traders,
+                    width='stretch'
+                )
 
         with tab3:
             st.markdown("### 🎯 Trader Segmentation Analysis")
             
-            segments = analyzer.segment_traders()
+            include_risk = st.checkbox(
+                "Include risk features (drawdown, Sharpe/Sortino, losing streaks, PnL concentration) in clustering",
+                value=False
+            )
+            segments, risk = run_trader_analysis(merged_df, include_risk)
             
             # Cluster visualization
             fig_cluster = px.scatter(
@@ -474,6 +532,13 @@ if (sentiment_file and trades_file) or local_data_exists:
                 )
                 st.plotly_chart(fig_cluster_dist, width='stretch')
 
+            # Per-account risk profile
+            st.markdown("#### 🛡️ Trader Risk Profile")
+            st.dataframe(
+                risk.sort_values('max_drawdown', ascending=False),
+                width='stretch'
+            )
+
         with tab4:
             st.markdown("### 🚀 Actionable Strategy Recommendations")
             
@@ -491,7 +556,27 @@ if (sentiment_file and trades_file) or local_data_exists:
                         <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem;'>{rec}</p>
                     </div>
                 """, unsafe_allow_html=True)
-            
+
+            # Backtest of sentiment-conditioned rule variants
+            st.markdown("---")
+            st.markdown("### 🧪 Backtested Rule Variants")
+            st.caption("Historical trades replayed with positions scaled in Greed and leverage capped in Fear, ranked by total PnL.")
+
+            backtest = run_backtest(merged_df)
+            st.dataframe(
+                backtest.head(20).rename(columns={
+                    'greed_size_scale': 'Greed Size Scale',
+                    'fear_leverage_cap': 'Fear Leverage Cap',
+                    'total_pnl': 'Total PnL',
+                    'max_drawdown': 'Max Drawdown',
+                    'winning_day_rate': 'Winning Day Rate',
+                    'median_account_drawdown': 'Median Account Drawdown',
+                    'profitable_accounts': 'Profitable Accounts'
+                }),
+                width='stretch',
+                hide_index=True
+            )
+
             # Additional insights
             st.markdown("---")
             st.markdown("### 📈 Key Insights")
@@ -0,0 +1,92 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules whose cold import must stay cheap, and the heavy packages they must not pull in
+MODULES = ['src.data_loader', 'src.analysis', 'src.backtest']
+HEAVY_MODULES = ['sklearn', 'plotly', 'streamlit', 'matplotlib', 'seaborn']
+BUDGET_SECONDS = 1.0
+
+# Probes run from the repo root so `src` is importable wherever this script is launched from
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed)
+print(','.join(heavy))
+"""
+
+
+def measure(module, runs):
+    # Each run uses a fresh interpreter so the import is cold
+    timings = []
+    heavy = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=REPO_ROOT
+        )
+        elapsed, loaded = result.stdout.split('\n')[:2]
+        timings.append(float(elapsed))
+        heavy = [name for name in loaded.split(',') if name]
+    return min(timings), heavy
+
+
+def top_imports(module, limit):
+    # Cumulative times from `python -X importtime` for the module and its direct imports
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT
+    )
+    # Children are printed before their parent, so collect direct imports until the module itself appears
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative_us), name.strip()))
+        elif depth == 0:
+            if name.strip() == module:
+                return [(int(cumulative_us), module)] + sorted(children, reverse=True)[:limit]
+            children = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report cold-import times and enforce a startup budget")
+    parser.add_argument('--budget', type=float, default=BUDGET_SECONDS, help="Maximum cold-import time per module in seconds")
+    parser.add_argument('--runs', type=int, default=3, help="Cold imports per module; the fastest is reported")
+    parser.add_argument('--top', type=int, default=5, help="Number of slowest imports to list per module")
+    args = parser.parse_args()
+
+    failures = []
+    print("Cold Import Times")
+    print("=================")
+    for module in MODULES:
+        elapsed, heavy = measure(module, args.runs)
+        status = "OK" if elapsed <= args.budget and not heavy else "FAIL"
+        print(f"\n{module}: {elapsed * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms) [{status}]")
+        for cumulative_us, name in top_imports(module, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        if elapsed > args.budget:
+            failures.append(f"{module} took {elapsed:.2f}s (budget {args.budget:.2f}s)")
+        if heavy:
+            failures.append(f"{module} eagerly imports {', '.join(heavy)}")
+
+    if failures:
+        print("\n[Error] Import budget exceeded:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
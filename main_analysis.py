@@ -1,7 +1,5 @@
 from src.data_loader import DataLoader
 from src.analysis import Analyzer
-import pandas as pd
-import sys
 
 def main():
     print("Trader Performance Analysis Tool")
@@ -29,10 +27,18 @@ def main():
         segments = analyzer.segment_traders()
         print(segments.head())
         
+        if 'Value' in merged_df.columns:
+            print("\n--- Most Sentiment-Sensitive Traders ---")
+            print(analyzer.sentiment_sensitive_traders(top=5))
+        
         print("\n--- Suggested Strategies ---")
         recs = analyzer.get_strategy_recommendations()
         for r in recs:
             print(f"- {r}")
+        
+        print("\n--- Backtested Rule Variants (Top 5) ---")
+        backtest = analyzer.backtest_strategies()
+        print(backtest.head())
             
     except FileNotFoundError:
         print("\n[Error] Data files not found in 'data/' directory.")
@@ -1,13 +1,19 @@
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 class Analyzer:
-    def __init__(self, df):
+    def __init__(self, df, store=None):
         self.df = df
+        # Optional src.store.TradeStore; when set, aggregations run as SQL
+        self.store = store
+        self._risk_features = None
+        self._lag_analysis = None
         
     def calculate_metrics(self):
+        # The store already holds the aggregates, so skip the DataFrame pass entirely
+        if self.store is not None:
+            return self.store.daily_metrics()
+
         self.df['win'] = self.df['closedPnL'] > 0
         
         # Calculate leverage if missing
@@ -16,7 +22,7 @@ class Analyzer:
             # If we have Size USD and Entry Price/Size Tokens, we can't infer leverage directly without Margin used.
             # We will default to 1x leverage if not provided to allow pipeline to continue.
             self.df['leverage'] = 1.0
-            
+        
         aggregations = {
             'closedPnL': 'sum',
             'win': 'mean',
@@ -44,15 +50,37 @@ class Analyzer:
         })
         return comparison
 
-    def segment_traders(self):
-        trader_stats = self.df.groupby('account').agg({
-            'closedPnL': 'sum',
-            'leverage': 'mean',
-            'symbol': 'count',
-            'win': 'mean'
-        }).rename(columns={'symbol': 'total_trades', 'win': 'win_rate'})
+    def risk_features(self):
+        # Computed once per Analyzer; segment_traders(include_risk=True) reuses it
+        from src.risk import compute_risk_features
+
+        if self._risk_features is None:
+            self._risk_features = compute_risk_features(self.df)
+        return self._risk_features
+
+    def segment_traders(self, include_risk=False):
+        # scikit-learn is only needed for clustering; importing it here keeps `import src.analysis` fast
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
+
+        if self.store is not None:
+            trader_stats = self.store.trader_totals()
+        else:
+            trader_stats = self.df.groupby('account').agg({
+                'closedPnL': 'sum',
+                'leverage': 'mean',
+                'symbol': 'count',
+                'win': 'mean'
+            }).rename(columns={'symbol': 'total_trades', 'win': 'win_rate'})
+        
+        feature_columns = ['leverage', 'total_trades', 'win_rate']
+        if include_risk:
+            from src.risk import RISK_FEATURES
+
+            trader_stats = trader_stats.join(self.risk_features()[RISK_FEATURES])
+            feature_columns += RISK_FEATURES
         
-        features = trader_stats[['leverage', 'total_trades', 'win_rate']].fillna(0)
+        features = trader_stats[feature_columns].fillna(0)
         scaler = StandardScaler()
         scaled_features = scaler.fit_transform(features)
         
@@ -76,3 +104,25 @@ class Analyzer:
             recommendations.append("Capital Preservation: Reduce exposure during high volatility Greed periods.")
             
         return recommendations
+
+    def sentiment_lag_analysis(self, max_lag=7):
+        # Reused across calls with the same max_lag so the per-trade arrays are only prepared once
+        from src.lag_analysis import SentimentLagAnalysis
+
+        if self._lag_analysis is None or self._lag_analysis.max_lag != max_lag:
+            self._lag_analysis = SentimentLagAnalysis(self.df, max_lag=max_lag)
+        return self._lag_analysis
+
+    def sentiment_lag_profile(self, max_lag=7):
+        return self.sentiment_lag_analysis(max_lag).lag_profile()
+
+    def sentiment_sensitive_traders(self, max_lag=7, signal='value', metric='pnl', top=20):
+        return self.sentiment_lag_analysis(max_lag).sensitive_traders(signal=signal, metric=metric, top=top)
+
+    def backtest_strategies(self, size_scales=None, leverage_caps=None):
+        from src.backtest import Backtester
+
+        if 'leverage' not in self.df.columns:
+            self.df['leverage'] = 1.0
+
+        return Backtester(self.df).run(size_scales=size_scales, leverage_caps=leverage_caps)
@@ -0,0 +1,161 @@
+import pandas as pd
+import numpy as np
+
+DEFAULT_SIZE_SCALES = np.round(np.arange(0.0, 2.01, 0.1), 2)
+DEFAULT_LEVERAGE_CAPS = np.array([1, 2, 3, 5, 10, 15, 20, 25, 50, np.inf])
+
+
+class Backtester:
+    # Replays historical trades under sentiment-conditioned rules:
+    #   - Greed days: every position is scaled by `size_scale`
+    #   - Fear days: leverage is capped at `leverage_cap`
+    # PnL is assumed linear in size and leverage, so each rule only rescales the
+    # realized PnL of the original trades. The (size_scale x leverage_cap) grid
+    # is evaluated on dense (rule, account, day) arrays, in blocks of rules.
+    def __init__(self, df):
+        self.df = df
+        self._prepare()
+
+    def _prepare(self):
+        df = self.df.dropna(subset=['date'])
+        classification = df['Classification'].fillna('').astype(str) if 'Classification' in df.columns else pd.Series('', index=df.index)
+
+        pnl = pd.to_numeric(df['closedPnL'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        if 'leverage' in df.columns:
+            leverage = pd.to_numeric(df['leverage'], errors='coerce').fillna(1.0).to_numpy(dtype=float)
+        else:
+            leverage = np.ones(len(df))
+        leverage = np.where(leverage > 0, leverage, 1.0)
+
+        self.accounts, account_idx = np.unique(df['account'].astype(str).to_numpy(), return_inverse=True)
+        self.days, day_idx = np.unique(df['date'].to_numpy(), return_inverse=True)
+        self.cell_idx = account_idx * len(self.days) + day_idx
+        self.n_cells = len(self.accounts) * len(self.days)
+
+        self.is_greed = classification.str.contains('Greed').to_numpy()
+        self.is_fear = classification.str.contains('Fear').to_numpy()
+        self.pnl = pnl
+        self.leverage = leverage
+
+        other = ~(self.is_greed | self.is_fear)
+        self.base_cells = np.bincount(self.cell_idx[other], weights=pnl[other], minlength=self.n_cells)
+        self.greed_cells = np.bincount(self.cell_idx[self.is_greed], weights=pnl[self.is_greed], minlength=self.n_cells)
+        self.active = np.bincount(self.cell_idx, minlength=self.n_cells) > 0
+        self.greed_active = np.bincount(self.cell_idx[self.is_greed], minlength=self.n_cells) > 0
+
+    def _fear_cells(self, leverage_caps):
+        # A Fear trade under cap c keeps its full PnL when leverage <= c, otherwise
+        # it is scaled by c / leverage. Bucket trades by the first cap they fit
+        # under so every cap is a cumulative sum over buckets instead of a loop.
+        caps = np.asarray(leverage_caps, dtype=float)
+        order = np.argsort(caps)
+        sorted_caps = caps[order]
+
+        cells = self.cell_idx[self.is_fear]
+        pnl = self.pnl[self.is_fear]
+        leverage = self.leverage[self.is_fear]
+        bucket = np.searchsorted(sorted_caps, leverage, side='left')
+
+        n_buckets = len(caps) + 1
+        full = np.bincount(bucket * self.n_cells + cells, weights=pnl, minlength=n_buckets * self.n_cells).reshape(n_buckets, self.n_cells)
+        # Buckets are stored in reverse so a prefix sum gives "trades that exceed each cap"
+        reverse = (n_buckets - 1 - bucket) * self.n_cells + cells
+        per_lev = np.bincount(reverse, weights=pnl / leverage, minlength=n_buckets * self.n_cells).reshape(n_buckets, self.n_cells)
+
+        # Row k: trades that fit under sorted_caps[k] + sorted_caps[k] * (PnL / leverage of trades that exceed it)
+        under = np.cumsum(full, axis=0, out=full)[:-1]
+        over = np.cumsum(per_lev, axis=0, out=per_lev)[::-1][1:]
+        over *= np.where(np.isinf(sorted_caps), 0.0, sorted_caps)[:, None]
+        over += under
+
+        result = np.empty_like(over)
+        result[order] = over
+        return result
+
+    @staticmethod
+    def _validate_grid(size_scales, leverage_caps):
+        # NaN or negative values would silently produce NaN or meaningless PnL
+        if size_scales.ndim != 1 or len(size_scales) == 0:
+            raise ValueError("size_scales must be a non-empty list of numbers")
+        if leverage_caps.ndim != 1 or len(leverage_caps) == 0:
+            raise ValueError("leverage_caps must be a non-empty list of numbers")
+        if not np.isfinite(size_scales).all() or (size_scales < 0).any():
+            raise ValueError(f"size_scales must be finite and non-negative, got {size_scales.tolist()}")
+        if np.isnan(leverage_caps).any() or (leverage_caps <= 0).any():
+            raise ValueError(f"leverage_caps must be positive (inf means no cap), got {leverage_caps.tolist()}")
+
+    def _rule_grid(self, size_scales, leverage_caps):
+        scale_grid, cap_grid = np.meshgrid(np.arange(len(size_scales)), np.arange(len(leverage_caps)), indexing='ij')
+        rules = pd.DataFrame({
+            'greed_size_scale': size_scales[scale_grid.ravel()],
+            'fear_leverage_cap': leverage_caps[cap_grid.ravel()],
+        })
+        return rules, cap_grid.ravel()
+
+    def _evaluate(self, sl, scales, fixed, total_pnl, max_drawdown, winning_day_rate, account_drawdown, profitable_accounts):
+        # (rule, cell) -> (rule, account, day); `fixed` is the non-Greed PnL for one leverage cap
+        pnl = scales[:, None] * self.greed_cells[None, :]
+        pnl += fixed[None, :]
+        pnl = pnl.reshape(len(scales), len(self.accounts), len(self.days))
+
+        # A zero scale means Greed trades were skipped entirely
+        skipped = (scales == 0)[:, None] & self.greed_active[None, :]
+        traded = (self.active[None, :] & ~skipped).reshape(pnl.shape)
+        # Share of traded (account, day) cells that closed positive; not the per-trade win rate
+        winning_days = ((pnl > 0) & traded).sum(axis=(1, 2))
+        traded_count = traded.sum(axis=(1, 2))
+        winning_day_rate[sl] = np.divide(winning_days, traded_count, out=np.zeros(len(winning_days)), where=traded_count > 0)
+
+        equity = np.cumsum(pnl.sum(axis=1), axis=1)
+        drawdown = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1) - equity
+        total_pnl[sl] = equity[:, -1]
+        max_drawdown[sl] = drawdown.max(axis=1)
+
+        # Per-account equity curves, accumulated in place to avoid extra full-size copies
+        account_equity = np.cumsum(pnl, axis=2, out=pnl)
+        profitable_accounts[sl] = (account_equity[:, :, -1] > 0).mean(axis=1)
+        peak = np.maximum(account_equity, 0.0)
+        np.maximum.accumulate(peak, axis=2, out=peak)
+        peak -= account_equity
+        account_drawdown[sl] = np.median(peak.max(axis=2), axis=1)
+
+    def run(self, size_scales=None, leverage_caps=None, max_cells=2 ** 24):
+        size_scales = np.asarray(DEFAULT_SIZE_SCALES if size_scales is None else size_scales, dtype=float)
+        leverage_caps = np.asarray(DEFAULT_LEVERAGE_CAPS if leverage_caps is None else leverage_caps, dtype=float)
+        self._validate_grid(size_scales, leverage_caps)
+        rules, cap_idx = self._rule_grid(size_scales, leverage_caps)
+        scales = rules['greed_size_scale'].to_numpy()
+        n_rules = len(rules)
+
+        total_pnl = np.zeros(n_rules)
+        max_drawdown = np.zeros(n_rules)
+        winning_day_rate = np.zeros(n_rules)
+        account_drawdown = np.zeros(n_rules)
+        profitable_accounts = np.zeros(n_rules)
+
+        # Both the Fear rows and the (rule, account, day) arrays are built in blocks
+        # so that neither grows past roughly `max_cells` values at a time. A block of
+        # k caps needs about (3k + 2) x cells values in _fear_cells, and each block of
+        # rules needs two (rule, account, day) buffers in _evaluate. At least one cap
+        # and one rule are evaluated per block, so memory never drops below O(cells).
+        n_cells = max(self.n_cells, 1)
+        cap_block = max(1, (max_cells // n_cells - 2) // 3)
+        rule_block = max(1, max_cells // (2 * n_cells))
+        for cap_start in range(0, len(leverage_caps) if self.n_cells else 0, cap_block):
+            cap_stop = min(cap_start + cap_block, len(leverage_caps))
+            fear = self._fear_cells(leverage_caps[cap_start:cap_stop])
+
+            for cap in range(cap_start, cap_stop):
+                fixed = self.base_cells + fear[cap - cap_start]
+                cap_rules = np.flatnonzero(cap_idx == cap)
+                for start in range(0, len(cap_rules), rule_block):
+                    sl = cap_rules[start:start + rule_block]
+                    self._evaluate(sl, scales[sl], fixed, total_pnl, max_drawdown, winning_day_rate, account_drawdown, profitable_accounts)
+
+        rules['total_pnl'] = total_pnl
+        rules['max_drawdown'] = max_drawdown
+        rules['winning_day_rate'] = winning_day_rate
+        rules['median_account_drawdown'] = account_drawdown
+        rules['profitable_accounts'] = profitable_accounts
+
+        return rules.sort_values('total_pnl', ascending=False).reset_index(drop=True)
@@ -1,10 +1,13 @@
 import pandas as pd
 import numpy as np
+from src.ingest import read_upload
 
 class DataLoader:
-    def __init__(self, sentiment_path, trades_path):
+    def __init__(self, sentiment_path, trades_path, db_path=None):
         self.sentiment_path = sentiment_path
         self.trades_path = trades_path
+        # Optional SQLite file to persist preprocessed data into (see build_store)
+        self.db_path = db_path
 
     def load_data(self):
         try:
@@ -15,6 +18,16 @@ class DataLoader:
         except Exception as e:
             raise e
 
+    def load_uploads(self, progress=None, **limits):
+        # Paths are uploaded file objects here; see src.ingest.read_upload for formats and limits
+        uploads = [self.sentiment_path, self.trades_path]
+        frames = []
+        for i, upload in enumerate(uploads):
+            report = (lambda fraction, i=i: progress((i + fraction) / len(uploads))) if progress else None
+            frames.append(read_upload(upload, progress=report, **limits))
+        
+        return frames[0], frames[1]
+
     def preprocess_data(self, sentiment_df, trades_df):
         # Normalize column names (strip whitespace, lowercase)
         sentiment_df.columns = sentiment_df.columns.str.strip()
@@ -32,6 +45,12 @@ class DataLoader:
         else:
             print(f"Warning: 'Classification' column not found in sentiment data. Found: {list(sentiment_df.columns)}")
 
+        # Keep the numeric Fear & Greed index value (case-insensitive) for lag analysis
+        value_col = next((col for col in sentiment_df.columns if col.lower() in ['value', 'index_value', 'fear_greed_value', 'fng_value']), None)
+        if value_col:
+            sentiment_df.rename(columns={value_col: 'Value'}, inplace=True)
+            sentiment_df['Value'] = pd.to_numeric(sentiment_df['Value'], errors='coerce')
+
         sentiment_df['Date'] = pd.to_datetime(sentiment_df['Date'], errors='coerce')
         
         if 'time' in trades_df.columns:
@@ -83,6 +102,14 @@ class DataLoader:
         
         return sentiment_df, trades_df, merged_df
 
+    def build_store(self, sentiment_df, trades_df):
+        # Expects the frames returned by preprocess_data
+        from src.store import TradeStore
+        
+        if self.db_path is None:
+            raise ValueError("DataLoader was created without a db_path")
+        return TradeStore(self.db_path).load(sentiment_df, trades_df)
+
     def get_quality_report(self, df, name="Dataset"):
         report = {
             "name": name,
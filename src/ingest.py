@@ -0,0 +1,183 @@
+import io
+import os
+import gzip
+import zipfile
+
+import pandas as pd
+
+# Limits apply per uploaded file and can be tuned per deployment
+MAX_UPLOAD_BYTES = int(os.environ.get('UPLOAD_MAX_MB', '500')) * 1024 * 1024
+MAX_UPLOAD_ROWS = int(os.environ.get('UPLOAD_MAX_ROWS', '5000000'))
+CHUNK_ROWS = 100_000
+
+MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+    b'PK\x03\x04': 'zip',
+    b'PAR1': 'parquet',
+}
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+    '.zip': 'zip',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+
+class UploadLimitError(ValueError):
+    pass
+
+
+class _CountingReader(io.RawIOBase):
+    # Counts bytes as they are read and aborts once `limit` is passed, so a
+    # small compressed upload cannot expand into an unbounded amount of data.
+    def __init__(self, stream, limit=None, on_read=None):
+        self.stream = stream
+        self.limit = limit
+        self.on_read = on_read
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        if self.limit is not None and self.bytes_read > self.limit:
+            raise UploadLimitError(f"Upload exceeds the {self.limit / 1024 / 1024:.0f} MB limit after decompression")
+        if self.on_read:
+            self.on_read(self.bytes_read)
+        return n
+
+
+def _upload_size(file):
+    size = getattr(file, 'size', None)
+    if size is None and file.seekable():
+        position = file.tell()
+        size = file.seek(0, io.SEEK_END)
+        file.seek(position)
+    return size
+
+
+def detect_format(file, name=''):
+    head = file.read(4)
+    file.seek(0)
+    for magic, fmt in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return fmt
+    return EXTENSIONS.get(os.path.splitext(name.lower())[1], 'csv')
+
+
+def _open_zip_member(file, max_bytes):
+    archive = zipfile.ZipFile(file)
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    csv_members = [info for info in members if info.filename.lower().endswith('.csv')]
+    if len(csv_members) != 1 and len(members) != 1:
+        raise ValueError(f"Zip upload must contain exactly one CSV file. Found: {[info.filename for info in members]}")
+    member = csv_members[0] if len(csv_members) == 1 else members[0]
+    if max_bytes is not None and member.file_size > max_bytes:
+        raise UploadLimitError(f"'{member.filename}' is {member.file_size / 1024 / 1024:.0f} MB uncompressed, over the {max_bytes / 1024 / 1024:.0f} MB limit")
+    return archive.open(member), member.file_size
+
+
+def _open_zstd(file):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading .zst uploads requires the 'zstandard' package")
+    return zstandard.ZstdDecompressor().stream_reader(file)
+
+
+def _read_parquet(file, name, max_bytes, max_rows, chunksize, report):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet uploads requires the 'pyarrow' package")
+
+    parquet_file = pq.ParquetFile(file)
+    total_rows = parquet_file.metadata.num_rows
+    if max_rows is not None and total_rows > max_rows:
+        raise UploadLimitError(f"'{name}' has {total_rows:,} rows, over the {max_rows:,} row limit")
+
+    # Like the CSV path, bound the decoded size and not just the compressed file:
+    # first by the uncompressed size recorded in the footer, then by the decoded
+    # batches themselves, since dictionary-encoded columns expand further on read
+    if max_bytes is not None:
+        metadata = parquet_file.metadata
+        uncompressed = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+        if uncompressed > max_bytes:
+            raise UploadLimitError(f"'{name}' is {uncompressed / 1024 / 1024:.0f} MB uncompressed, over the {max_bytes / 1024 / 1024:.0f} MB limit")
+
+    chunks = []
+    rows = 0
+    decoded_bytes = 0
+    for batch in parquet_file.iter_batches(batch_size=chunksize):
+        decoded_bytes += batch.nbytes
+        if max_bytes is not None and decoded_bytes > max_bytes:
+            raise UploadLimitError(f"'{name}' exceeds the {max_bytes / 1024 / 1024:.0f} MB limit after decompression")
+        chunks.append(batch.to_pandas())
+        rows += batch.num_rows
+        report(rows / total_rows if total_rows else 1.0)
+    if not chunks:
+        return parquet_file.schema_arrow.empty_table().to_pandas()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _throttle(progress):
+    # Only forward whole-percent changes so UI callbacks are not flooded per buffer read
+    last = [-1]
+
+    def report(fraction):
+        percent = int(fraction * 100)
+        if percent > last[0]:
+            last[0] = percent
+            progress(fraction)
+
+    return report
+
+
+def read_upload(file, name=None, max_bytes=MAX_UPLOAD_BYTES, max_rows=MAX_UPLOAD_ROWS, chunksize=CHUNK_ROWS, progress=None):
+    # Parses a CSV (plain, gzip, zstd or zip) or Parquet upload in chunks.
+    # `progress` is called with the fraction of the upload consumed so far.
+    name = name or getattr(file, 'name', '') or ''
+    report = _throttle(progress) if progress else (lambda fraction: None)
+
+    size = _upload_size(file)
+    if max_bytes is not None and size is not None and size > max_bytes:
+        raise UploadLimitError(f"'{name}' is {size / 1024 / 1024:.0f} MB, over the {max_bytes / 1024 / 1024:.0f} MB limit")
+
+    fmt = detect_format(file, name)
+    if fmt == 'parquet':
+        df = _read_parquet(file, name, max_bytes, max_rows, chunksize, report)
+        report(1.0)
+        return df
+
+    # Progress follows the raw (possibly compressed) bytes consumed
+    raw = _CountingReader(file, on_read=(lambda n: report(min(n / size, 1.0))) if size else None)
+    if fmt == 'gzip':
+        stream = gzip.GzipFile(fileobj=io.BufferedReader(raw))
+    elif fmt == 'zstd':
+        stream = _open_zstd(io.BufferedReader(raw))
+    elif fmt == 'zip':
+        # Zip needs random access to its directory; progress follows the extracted bytes instead
+        member, member_size = _open_zip_member(file, max_bytes)
+        stream = _CountingReader(member, on_read=(lambda n: report(min(n / member_size, 1.0))) if member_size else None)
+    else:
+        stream = raw
+
+    reader = io.BufferedReader(_CountingReader(stream, limit=max_bytes))
+    chunks = []
+    rows = 0
+    for chunk in pd.read_csv(reader, chunksize=chunksize):
+        rows += len(chunk)
+        if max_rows is not None and rows > max_rows:
+            raise UploadLimitError(f"'{name}' has more than {max_rows:,} rows")
+        chunks.append(chunk)
+
+    report(1.0)
+    return pd.concat(chunks, ignore_index=True)
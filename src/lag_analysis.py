@@ -0,0 +1,171 @@
+import pandas as pd
+import numpy as np
+
+SIGNALS = ['value', 'value_change']
+METRICS = ['pnl', 'win_rate', 'leverage']
+
+
+def _xcorr(a, b, max_lag, nfft):
+    # sum_t a[..., t] * b[..., t + k] for k in [-max_lag, max_lag], via FFT.
+    # nfft >= days + max_lag, so the circular product never wraps into the window.
+    spectrum = np.conj(np.fft.rfft(a, nfft)) * np.fft.rfft(b, nfft)
+    full = np.fft.irfft(spectrum, nfft)
+    return np.concatenate([full[..., nfft - max_lag:], full[..., :max_lag + 1]], axis=-1)
+
+
+def lagged_correlation(signal, signal_mask, x, x_mask, max_lag, min_obs):
+    # Pearson correlation between signal[t] and x[..., t + k] for every row of x
+    # and every lag k, using only days where both sides are observed. All the
+    # pairwise sums are cross-correlations, so each is one batched FFT.
+    nfft = 1 << int(np.ceil(np.log2(signal.shape[-1] + max_lag + 1)))
+    s = np.where(signal_mask, signal, 0.0)
+    v = np.where(x_mask, x, 0.0)
+    ms = signal_mask.astype(float)
+    mv = x_mask.astype(float)
+
+    # Centering first keeps the sums small and the FFT round-off negligible
+    s = np.where(signal_mask, s - s.sum() / max(ms.sum(), 1), 0.0)
+    row_counts = np.maximum(mv.sum(axis=-1, keepdims=True), 1)
+    v = np.where(x_mask, v - v.sum(axis=-1, keepdims=True) / row_counts, 0.0)
+
+    n = np.rint(_xcorr(ms, mv, max_lag, nfft))
+    sum_s = _xcorr(s, mv, max_lag, nfft)
+    sum_v = _xcorr(ms, v, max_lag, nfft)
+    sum_ss = _xcorr(s * s, mv, max_lag, nfft)
+    sum_vv = _xcorr(ms, v * v, max_lag, nfft)
+    sum_sv = _xcorr(s, v, max_lag, nfft)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_sv - sum_s * sum_v / n
+        var_s = sum_ss - sum_s ** 2 / n
+        var_v = sum_vv - sum_v ** 2 / n
+        corr = cov / np.sqrt(var_s * var_v)
+
+    valid = (n >= min_obs) & (var_s > 1e-9 * sum_ss) & (var_v > 1e-9 * sum_vv)
+    return np.where(valid, np.clip(corr, -1.0, 1.0), np.nan), n
+
+
+class SentimentLagAnalysis:
+    # Correlates the daily Fear & Greed value (and its day-over-day change) with
+    # daily PnL, win rate and leverage across lead/lag days. A positive lag k
+    # pairs sentiment on day t with trading on day t + k (sentiment leads).
+    def __init__(self, df, max_lag=7, min_obs=20):
+        if 'Value' not in df.columns:
+            raise KeyError(f"Could not find the sentiment 'Value' column in merged data. Found: {list(df.columns)}")
+        if max_lag < 0:
+            raise ValueError(f"max_lag must be non-negative, got {max_lag}")
+        self.df = df.dropna(subset=['account', 'date'])
+        self.max_lag = max_lag
+        self.min_obs = min_obs
+        self.lags = np.arange(-max_lag, max_lag + 1)
+        self._prepare()
+
+    def _prepare(self):
+        # Only per-trade arrays (sorted by account) and per-day series are kept;
+        # account x day matrices are built per block of accounts when needed.
+        df = self.df
+        dates = pd.to_datetime(df['date']).dt.normalize()
+        self.days = pd.date_range(dates.min(), dates.max(), freq='D') if len(df) else pd.DatetimeIndex([])
+        day_idx = ((dates - dates.min()) // pd.Timedelta(days=1)).to_numpy(dtype=int) if len(df) else np.zeros(0, dtype=int)
+        codes, self.accounts = pd.factorize(df['account'], sort=True)
+        n_days = len(self.days)
+
+        pnl = pd.to_numeric(df['closedPnL'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        leverage = pd.to_numeric(df['leverage'], errors='coerce').to_numpy(dtype=float) if 'leverage' in df.columns else np.ones(len(df))
+
+        order = np.argsort(codes, kind='stable')
+        self._day_idx = day_idx[order]
+        self._pnl = pnl[order]
+        self._leverage = leverage[order]
+        # Trades of accounts [i, j) are rows offsets[i]:offsets[j] of the sorted arrays
+        self._offsets = np.searchsorted(codes[order], np.arange(len(self.accounts) + 1))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Aggregate daily series across all accounts
+            day_count = np.bincount(day_idx, minlength=n_days)
+            wins = np.bincount(day_idx, weights=(pnl > 0).astype(float), minlength=n_days)
+            has_leverage = ~np.isnan(leverage)
+            day_leverage_count = np.bincount(day_idx[has_leverage], minlength=n_days)
+            day_leverage_sum = np.bincount(day_idx[has_leverage], weights=leverage[has_leverage], minlength=n_days)
+            self.aggregate = {
+                'pnl': np.where(day_count > 0, np.bincount(day_idx, weights=pnl, minlength=n_days), np.nan),
+                'win_rate': np.where(day_count > 0, wins / day_count, np.nan),
+                'leverage': np.where(day_leverage_count > 0, day_leverage_sum / day_leverage_count, np.nan),
+            }
+
+        value = df.groupby(dates.to_numpy())['Value'].first().reindex(self.days).to_numpy(dtype=float)
+        self.signals = {
+            'value': value,
+            'value_change': np.concatenate([[np.nan], np.diff(value)]) if n_days else value,
+        }
+
+    def _metric_matrix(self, metric, start, stop):
+        # (account, day) matrix of `metric` for accounts [start, stop); NaN where the account did not trade
+        rows = slice(self._offsets[start], self._offsets[stop])
+        n_days = len(self.days)
+        shape = (stop - start, n_days)
+        size = shape[0] * n_days
+        cell = np.repeat(np.arange(shape[0]), np.diff(self._offsets[start:stop + 1])) * n_days + self._day_idx[rows]
+        pnl = self._pnl[rows]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if metric == 'leverage':
+                leverage = self._leverage[rows]
+                has_leverage = ~np.isnan(leverage)
+                count = np.bincount(cell[has_leverage], minlength=size)
+                total = np.bincount(cell[has_leverage], weights=leverage[has_leverage], minlength=size)
+                return np.where(count > 0, total / count, np.nan).reshape(shape)
+
+            count = np.bincount(cell, minlength=size)
+            if metric == 'win_rate':
+                total = np.bincount(cell, weights=(pnl > 0).astype(float), minlength=size) / count
+            else:
+                total = np.bincount(cell, weights=pnl, minlength=size)
+            return np.where(count > 0, total, np.nan).reshape(shape)
+
+    def _correlate(self, signal, metric_values):
+        signal_mask = ~np.isnan(signal)
+        x_mask = ~np.isnan(metric_values)
+        return lagged_correlation(signal, signal_mask, metric_values, x_mask, self.max_lag, self.min_obs)
+
+    def lag_profile(self):
+        rows = []
+        for signal in SIGNALS:
+            for metric in METRICS:
+                corr, n = self._correlate(self.signals[signal], self.aggregate[metric])
+                rows.append(pd.DataFrame({
+                    'signal': signal,
+                    'metric': metric,
+                    'lag': self.lags,
+                    'correlation': corr,
+                    'n_obs': n.astype(int),
+                }))
+        return pd.concat(rows, ignore_index=True)
+
+    def account_correlations(self, signal='value', metric='pnl', max_cells=2 ** 22):
+        # (account, lag) correlation matrix; the metric matrix and FFT buffers are built per block of accounts
+        corr = np.full((len(self.accounts), len(self.lags)), np.nan)
+        n_obs = np.zeros((len(self.accounts), len(self.lags)), dtype=int)
+        block = max(1, max_cells // max(len(self.days), 1))
+        for start in range(0, len(self.accounts) if len(self.days) else 0, block):
+            stop = min(start + block, len(self.accounts))
+            corr[start:stop], n_obs[start:stop] = self._correlate(self.signals[signal], self._metric_matrix(metric, start, stop))
+        return pd.DataFrame(corr, index=pd.Index(self.accounts, name='account'), columns=self.lags), n_obs
+
+    def sensitive_traders(self, signal='value', metric='pnl', top=20):
+        corr, n_obs = self.account_correlations(signal, metric)
+        values = corr.to_numpy()
+        has_corr = ~np.isnan(values).all(axis=1)
+
+        best = np.zeros(len(values), dtype=int)
+        best[has_corr] = np.nanargmax(np.abs(values[has_corr]), axis=1)
+        rows = np.arange(len(values))
+
+        ranked = pd.DataFrame({
+            'best_lag': self.lags[best],
+            'correlation': values[rows, best],
+            'n_obs': n_obs[rows, best],
+        }, index=corr.index)[has_corr]
+        ranked['abs_correlation'] = ranked['correlation'].abs()
+        ranked = ranked.sort_values('abs_correlation', ascending=False).drop(columns='abs_correlation')
+        return ranked.head(top) if top is not None else ranked
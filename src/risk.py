@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+
+TRADING_DAYS = 365  # crypto trades every day
+
+RISK_FEATURES = ['max_drawdown', 'sharpe', 'sortino', 'longest_losing_streak', 'pnl_concentration']
+
+
+def _sort_by_account(codes, *keys):
+    # np.lexsort sorts by the last key first
+    return np.lexsort(tuple(reversed(keys)) + (codes,))
+
+
+def _trade_order_key(df):
+    # Same time column detection as DataLoader.preprocess_data, falling back to the trade date
+    time_col = next((col for col in df.columns if col.lower() in ['time', 'timestamp', 'created_time']), 'date')
+    key = df[time_col]
+    if not pd.api.types.is_numeric_dtype(key):
+        key = pd.to_datetime(key, errors='coerce')
+    return key.to_numpy()
+
+
+def compute_risk_features(df):
+    # Per-account risk features from one sorted pass over the trades. Everything
+    # is a grouped cumulative op or reduction on integer account codes, so there
+    # is no Python-level loop over accounts.
+    df = df.dropna(subset=['account', 'date'])
+    codes, accounts = pd.factorize(df['account'], sort=True)
+    pnl = pd.to_numeric(df['closedPnL'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    dates = pd.to_datetime(df['date']).dt.normalize().to_numpy()
+
+    # Daily PnL per account, sorted by (account, day)
+    daily = pd.DataFrame({'code': codes, 'date': dates, 'pnl': pnl}).groupby(['code', 'date'], sort=True)['pnl'].sum()
+    daily_codes = daily.index.get_level_values('code').to_numpy()
+    daily_pnl = daily.to_numpy()
+    by_account = pd.Series(daily_pnl).groupby(daily_codes, sort=True)
+    daily_dates = pd.Series(daily.index.get_level_values('date')).groupby(daily_codes, sort=True)
+
+    # Drawdown from the running equity peak (starting capital counts as a peak of 0)
+    equity = by_account.cumsum()
+    peak = equity.clip(lower=0.0).groupby(daily_codes).cummax()
+    max_drawdown = (peak - equity).groupby(daily_codes).max()
+
+    # Sharpe / Sortino of daily PnL, annualized. Every calendar day between an
+    # account's first and last trade counts, with inactive days as 0 PnL, so
+    # trading rarely does not inflate the ratios.
+    span_days = (daily_dates.max() - daily_dates.min()).dt.days + 1
+    mean = by_account.sum() / span_days
+    idle_days = span_days - by_account.size()
+    squared_dev = pd.Series((daily_pnl - mean.to_numpy()[daily_codes]) ** 2).groupby(daily_codes).sum()
+    std = ((squared_dev + idle_days * mean ** 2) / (span_days - 1).where(span_days > 1)) ** 0.5
+    downside = (pd.Series(np.minimum(daily_pnl, 0.0) ** 2).groupby(daily_codes).sum() / span_days) ** 0.5
+    sharpe = (mean / std.where(std > 0)) * np.sqrt(TRADING_DAYS)
+    sortino = (mean / downside.where(downside > 0)) * np.sqrt(TRADING_DAYS)
+
+    # Share of absolute PnL that came from the single biggest day
+    abs_pnl = pd.Series(np.abs(daily_pnl)).groupby(daily_codes)
+    total_abs = abs_pnl.sum()
+    pnl_concentration = abs_pnl.max() / total_abs.where(total_abs > 0)
+
+    # Longest run of consecutive losing trades; zero-PnL fills (position opens) are skipped
+    closed = pnl != 0
+    closed_codes = codes[closed]
+    order = _sort_by_account(closed_codes, _trade_order_key(df)[closed])
+    streak_codes = closed_codes[order]
+    loss = pnl[closed][order] < 0
+    new_run = np.ones(len(loss), dtype=bool)
+    new_run[1:] = (loss[1:] != loss[:-1]) | (streak_codes[1:] != streak_codes[:-1])
+    position = np.arange(len(loss))
+    run_start = np.maximum.accumulate(np.where(new_run, position, 0))
+    run_length = np.where(loss, position - run_start + 1, 0)
+    longest_losing_streak = pd.Series(run_length).groupby(streak_codes).max()
+
+    features = pd.DataFrame({
+        'max_drawdown': max_drawdown,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'longest_losing_streak': longest_losing_streak,
+        'pnl_concentration': pnl_concentration,
+        'active_days': by_account.size(),
+    }, index=np.arange(len(accounts)))
+    features['longest_losing_streak'] = features['longest_losing_streak'].fillna(0).astype(int)
+    features.index = pd.Index(accounts, name='account')
+
+    return features
@@ -0,0 +1,318 @@
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+import pandas as pd
+
+from src.data_loader import DataLoader
+from src.analysis import Analyzer
+from src.lag_analysis import SIGNALS, METRICS
+from src.backtest import DEFAULT_SIZE_SCALES, DEFAULT_LEVERAGE_CAPS
+
+# Each backtest rule is a full pass over the (account, day) grid under the compute lock
+MAX_BACKTEST_RULES = 400
+
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _flatten_columns(df):
+    df = df.copy()
+    df.columns = [
+        '_'.join(str(part) for part in col).strip('_') if isinstance(col, tuple) else col
+        for col in df.columns
+    ]
+    return df
+
+
+def _encode(result, fmt):
+    if fmt == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise HTTPError(501, "Arrow output requires the 'pyarrow' package")
+
+        if not isinstance(result, pd.DataFrame):
+            result = pd.DataFrame({'value': result})
+        table = pa.Table.from_pandas(result, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return ARROW_CONTENT_TYPE, sink.getvalue().to_pybytes()
+
+    if isinstance(result, pd.DataFrame):
+        body = result.to_json(orient='records', date_format='iso')
+    else:
+        body = json.dumps(result)
+    return JSON_CONTENT_TYPE, body.encode('utf-8')
+
+
+class AnalyticsService:
+    # ASGI app that loads DataLoader/Analyzer state once and serves analysis
+    # results from a single warm process. Encoded responses are kept in an LRU
+    # cache keyed by path and query parameters and bounded by their total size
+    # in bytes, and identical in-flight requests share one computation.
+    def __init__(self, sentiment_path, trades_path, cache_bytes=64 * 1024 * 1024):
+        self.sentiment_path = sentiment_path
+        self.trades_path = trades_path
+        self.cache_bytes = cache_bytes
+
+        self.sentiment_df = None
+        self.trades_df = None
+        self.merged_df = None
+        self.analyzer = None
+
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._inflight = {}
+        # Analyzer methods add columns to the shared frame, so computations run one at a time
+        self._compute_lock = threading.Lock()
+        self._load_lock = None
+
+        self.routes = {
+            '/comparison': self._comparison,
+            '/segments': self._segments,
+            '/risk': self._risk,
+            '/sentiment-lag': self._sentiment_lag,
+            '/sensitive-traders': self._sensitive_traders,
+            '/recommendations': self._recommendations,
+            '/backtest': self._backtest,
+            '/metrics': self._metrics,
+        }
+
+    def load(self):
+        loader = DataLoader(self.sentiment_path, self.trades_path)
+        sentiment_df, trades_df = loader.load_data()
+        self.sentiment_df, self.trades_df, self.merged_df = loader.preprocess_data(sentiment_df, trades_df)
+        analyzer = Analyzer(self.merged_df)
+        # Derives the win/leverage columns the other Analyzer methods rely on
+        analyzer.calculate_metrics()
+        self.analyzer = analyzer
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    async def ensure_loaded(self):
+        if self.analyzer is not None:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self.analyzer is None:
+                await asyncio.to_thread(self.load)
+
+    # --- Endpoints -------------------------------------------------------
+
+    def _comparison(self, params):
+        comparison = self.analyzer.compare_sentiment_performance()
+        return _flatten_columns(comparison).reset_index()
+
+    def _segments(self, params):
+        include_risk = params.get('include_risk', 'false').lower() in ('1', 'true', 'yes')
+        return self.analyzer.segment_traders(include_risk=include_risk).reset_index()
+
+    def _risk(self, params):
+        return self.analyzer.risk_features().reset_index()
+
+    def _max_lag_param(self, params):
+        # FFT buffers and the (account, lag) result grow with max_lag, so keep it inside the data
+        max_lag = self._int_param(params, 'max_lag') if 'max_lag' in params else 7
+        dates = pd.to_datetime(self.merged_df['date']).dropna()
+        n_days = (dates.max() - dates.min()).days + 1 if len(dates) else 0
+        if not 0 <= max_lag < n_days:
+            raise HTTPError(400, f"'max_lag' must be between 0 and {n_days - 1} (number of days - 1)")
+        return max_lag
+
+    def _sentiment_lag(self, params):
+        return self.analyzer.sentiment_lag_profile(max_lag=self._max_lag_param(params))
+
+    def _sensitive_traders(self, params):
+        max_lag = self._max_lag_param(params)
+        top = self._int_param(params, 'limit', minimum=0) if 'limit' in params else 20
+        signal = params.get('signal', 'value')
+        if signal not in SIGNALS:
+            raise HTTPError(400, f"'signal' must be one of {', '.join(repr(name) for name in SIGNALS)}")
+        metric = params.get('metric', 'pnl')
+        if metric not in METRICS:
+            raise HTTPError(400, f"'metric' must be one of {', '.join(repr(name) for name in METRICS)}")
+        return self.analyzer.sentiment_sensitive_traders(max_lag=max_lag, signal=signal, metric=metric, top=top).reset_index()
+
+    def _recommendations(self, params):
+        return self.analyzer.get_strategy_recommendations()
+
+    def _backtest(self, params):
+        def parse_grid(name):
+            if name not in params:
+                return None
+            try:
+                return [float(v) for v in params[name].split(',') if v]
+            except ValueError:
+                raise HTTPError(400, f"'{name}' must be a comma-separated list of numbers")
+
+        size_scales = parse_grid('size_scales')
+        leverage_caps = parse_grid('leverage_caps')
+        n_rules = len(DEFAULT_SIZE_SCALES if size_scales is None else size_scales) * len(DEFAULT_LEVERAGE_CAPS if leverage_caps is None else leverage_caps)
+        if n_rules > MAX_BACKTEST_RULES:
+            raise HTTPError(400, f"'size_scales' x 'leverage_caps' is {n_rules} rules, over the limit of {MAX_BACKTEST_RULES}")
+        limit = self._int_param(params, 'limit', minimum=0) if 'limit' in params else None
+
+        try:
+            result = self.analyzer.backtest_strategies(size_scales=size_scales, leverage_caps=leverage_caps)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return result.head(limit) if limit is not None else result
+
+    def _metrics(self, params):
+        metrics = self.analyzer.calculate_metrics()
+
+        if 'account' in params:
+            metrics = metrics[metrics['account'] == params['account']]
+        if 'classification' in params:
+            metrics = metrics[metrics['Classification'] == params['classification']]
+        for name, keep in (('start', lambda d, v: d >= v), ('end', lambda d, v: d <= v)):
+            if name in params:
+                bound = pd.to_datetime(params[name], errors='coerce')
+                if pd.isnull(bound):
+                    raise HTTPError(400, f"'{name}' must be a date")
+                metrics = metrics[keep(metrics['date'], bound)]
+        if 'limit' in params:
+            metrics = metrics.head(self._int_param(params, 'limit', minimum=0))
+
+        return metrics.reset_index(drop=True)
+
+    @staticmethod
+    def _int_param(params, name, minimum=None):
+        try:
+            value = int(params[name])
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an integer")
+        if minimum is not None and value < minimum:
+            raise HTTPError(400, f"'{name}' must be at least {minimum}")
+        return value
+
+    # --- Caching and coalescing ------------------------------------------
+
+    def _compute(self, path, params, fmt):
+        with self._compute_lock:
+            result = self.routes[path](params)
+        return _encode(result, fmt)
+
+    async def query(self, path, params):
+        if path not in self.routes:
+            raise HTTPError(404, f"Unknown endpoint '{path}'")
+
+        params = dict(params)
+        fmt = params.pop('format', 'json')
+        if fmt not in ('json', 'arrow'):
+            raise HTTPError(400, "'format' must be 'json' or 'arrow'")
+
+        key = (path, fmt, tuple(sorted(params.items())))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(path, params, fmt))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(future)
+
+    async def _run(self, path, params, fmt):
+        await self.ensure_loaded()
+        return await asyncio.to_thread(self._compute, path, params, fmt)
+
+    def _finish(self, key, future):
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        content_type, body = future.result()
+        # Responses larger than the whole budget are served but never cached
+        if len(body) > self.cache_bytes:
+            return
+        self._cache[key] = (content_type, body)
+        self._cached_bytes += len(body)
+        while self._cached_bytes > self.cache_bytes:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    # --- ASGI ------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.ensure_loaded()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, send):
+        status = 200
+        if scope['method'] not in ('GET', 'HEAD'):
+            status, content_type, body = 405, JSON_CONTENT_TYPE, json.dumps({'error': 'Method not allowed'}).encode('utf-8')
+        elif scope['path'] == '/health':
+            content_type, body = JSON_CONTENT_TYPE, json.dumps({'status': 'ok', 'loaded': self.analyzer is not None}).encode('utf-8')
+        else:
+            params = parse_qsl(scope.get('query_string', b'').decode('latin-1'))
+            try:
+                content_type, body = await self.query(scope['path'], params)
+            except HTTPError as e:
+                status, content_type, body = e.status, JSON_CONTENT_TYPE, json.dumps({'error': e.message}).encode('utf-8')
+            except Exception as e:
+                status, content_type, body = 500, JSON_CONTENT_TYPE, json.dumps({'error': str(e)}).encode('utf-8')
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', content_type.encode('latin-1')),
+                (b'content-length', str(len(body)).encode('latin-1')),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+
+app = AnalyticsService(
+    os.environ.get('SENTIMENT_PATH', 'data/sentiment.csv'),
+    os.environ.get('TRADES_PATH', 'data/trades.csv'),
+    cache_bytes=int(os.environ.get('SERVICE_CACHE_MB', '64')) * 1024 * 1024,
+)
+
+
+def main():
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the trader performance analysis over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
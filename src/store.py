@@ -0,0 +1,144 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+DATE_FORMAT = '%Y-%m-%d'
+STANDARD_COLUMNS = ('account', 'date', 'symbol', 'size', 'closedPnL', 'leverage')
+
+INDEXES = {
+    'idx_trades_account_date': 'trades (account, date)',
+    'idx_trades_date': 'trades (date)',
+    'idx_trades_symbol': 'trades (symbol)',
+}
+
+
+class TradeStore:
+    # Embedded SQLite copy of the preprocessed data. Trades are indexed on
+    # (account, date), date and symbol; sentiment is a dimension table keyed by
+    # date, so lookups and aggregations run as SQL instead of DataFrame scans.
+    def __init__(self, path):
+        self.path = path
+        # The connection is shared across threads (e.g. the service's worker
+        # threads), so every use of it is serialized with a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def load(self, sentiment_df, trades_df, chunksize=50_000):
+        sentiment = pd.DataFrame({
+            'date': pd.to_datetime(sentiment_df['Date'], errors='coerce').dt.strftime(DATE_FORMAT),
+            'classification': sentiment_df['Classification'] if 'Classification' in sentiment_df.columns else None,
+        })
+        value_col = next((col for col in sentiment_df.columns if col.lower() == 'value'), None)
+        sentiment['value'] = pd.to_numeric(sentiment_df[value_col], errors='coerce') if value_col else None
+        sentiment = sentiment.dropna(subset=['date']).drop_duplicates('date', keep='last')
+
+        trades = trades_df.copy()
+        trades['date'] = pd.to_datetime(trades['date'], errors='coerce').dt.strftime(DATE_FORMAT)
+        if 'leverage' not in trades.columns:
+            trades['leverage'] = 1.0
+        for col in ('account', 'symbol', 'size'):
+            if col not in trades.columns:
+                trades[col] = None
+
+        # SQLite column names are case-insensitive (e.g. a raw 'Date' next to the derived
+        # 'date'), so keep the standardized column and drop anything that collides with it
+        columns = list(STANDARD_COLUMNS) + [col for col in trades.columns if col not in STANDARD_COLUMNS]
+        seen = set()
+        keep = []
+        for col in columns:
+            if col.lower() not in seen:
+                seen.add(col.lower())
+                keep.append(col)
+        trades = trades[keep]
+
+        with self._lock, self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS trades")
+            self.conn.execute("DROP TABLE IF EXISTS sentiment")
+            self.conn.execute("CREATE TABLE sentiment (date TEXT PRIMARY KEY, classification TEXT, value REAL)")
+            self.conn.executemany("INSERT INTO sentiment VALUES (?, ?, ?)", sentiment.itertuples(index=False, name=None))
+
+            # to_sql inserts with executemany in batches of `chunksize` rows
+            trades.to_sql('trades', self.conn, index=False, chunksize=chunksize)
+
+            # Building indexes after the bulk insert is much cheaper than maintaining them per row
+            for name, target in INDEXES.items():
+                self.conn.execute(f"CREATE INDEX {name} ON {target}")
+            self.conn.execute("ANALYZE")
+
+        return self
+
+    def query(self, sql, params=()):
+        with self._lock:
+            df = pd.read_sql_query(sql, self.conn, params=params)
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def trades(self, account=None, start=None, end=None, classification=None, symbol=None):
+        # Each filter maps onto an indexed column, so lookups are index seeks
+        clauses = []
+        params = []
+        if account is not None:
+            clauses.append("t.account = ?")
+            params.append(account)
+        if start is not None:
+            clauses.append("t.date >= ?")
+            params.append(pd.to_datetime(start).strftime(DATE_FORMAT))
+        if end is not None:
+            clauses.append("t.date <= ?")
+            params.append(pd.to_datetime(end).strftime(DATE_FORMAT))
+        if classification is not None:
+            clauses.append("s.classification = ?")
+            params.append(classification)
+        if symbol is not None:
+            clauses.append("t.symbol = ?")
+            params.append(symbol)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.query(f"""
+            SELECT t.*, s.classification AS Classification, s.value AS Value
+            FROM trades t
+            LEFT JOIN sentiment s ON s.date = t.date
+            {where}
+            ORDER BY t.account, t.date
+        """, params)
+
+    def trader_history(self, account):
+        return self.trades(account=account)
+
+    def daily_metrics(self):
+        # Same shape as Analyzer.calculate_metrics
+        return self.query("""
+            SELECT t.account,
+                   t.date,
+                   s.classification AS Classification,
+                   SUM(t.closedPnL) AS closedPnL,
+                   AVG(CASE WHEN t.closedPnL > 0 THEN 1.0 ELSE 0.0 END) AS win_rate,
+                   AVG(t.size) AS avg_size,
+                   COUNT(t.symbol) AS trade_count,
+                   AVG(t.leverage) AS avg_leverage
+            FROM trades t
+            JOIN sentiment s ON s.date = t.date
+            WHERE t.account IS NOT NULL AND s.classification IS NOT NULL
+            GROUP BY t.account, t.date, s.classification
+            ORDER BY t.account, t.date, s.classification
+        """)
+
+    def trader_totals(self):
+        # Same shape as the per-account statistics in Analyzer.segment_traders
+        return self.query("""
+            SELECT account,
+                   SUM(closedPnL) AS closedPnL,
+                   AVG(leverage) AS leverage,
+                   COUNT(symbol) AS total_trades,
+                   AVG(CASE WHEN closedPnL > 0 THEN 1.0 ELSE 0.0 END) AS win_rate
+            FROM trades
+            WHERE account IS NOT NULL
+            GROUP BY account
+            ORDER BY account
+        """).set_index('account')
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import Backtester
+
+SIZE_SCALES = [0.0, 0.5, 1.0, 1.7]
+LEVERAGE_CAPS = [1.0, 3.0, 7.5, 20.0, np.inf]
+
+
+def make_trades(seed=0, n=3000):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2024-01-01', periods=40, freq='D')
+    classification = pd.Series(rng.choice(['Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed'], len(days)), index=days)
+    dates = days[rng.integers(0, len(days), n)]
+    return pd.DataFrame({
+        'account': rng.choice([f'acct{i}' for i in range(12)], n),
+        'date': dates,
+        'Classification': classification[dates].to_numpy(),
+        'closedPnL': np.where(rng.random(n) < 0.2, 0.0, rng.normal(0, 50, n)),
+        'leverage': rng.choice([1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 25.0, 50.0], n),
+    })
+
+
+def replay(df, scale, cap):
+    # Straightforward per-trade replay of one rule
+    greed = df['Classification'].str.contains('Greed')
+    fear = df['Classification'].str.contains('Fear')
+    pnl = df['closedPnL'].copy()
+    pnl[greed] *= scale
+    pnl[fear] *= np.minimum(1.0, cap / df.loc[fear, 'leverage'])
+
+    # Skipping Greed trades entirely means those days were not traded
+    traded = df.assign(pnl=pnl)[~(greed & (scale == 0))]
+    cells = traded.groupby(['account', 'date'])['pnl'].sum()
+
+    days = np.sort(df['date'].unique())
+    accounts = np.sort(df['account'].unique())
+    grid = df.assign(pnl=pnl).groupby(['account', 'date'])['pnl'].sum().unstack(fill_value=0.0)
+    grid = grid.reindex(index=accounts, columns=days, fill_value=0.0)
+
+    equity = grid.sum(axis=0).cumsum()
+    account_equity = grid.cumsum(axis=1)
+    account_drawdown = (account_equity.clip(lower=0.0).cummax(axis=1) - account_equity).max(axis=1)
+    return {
+        'total_pnl': equity.iloc[-1],
+        'max_drawdown': (equity.clip(lower=0.0).cummax() - equity).max(),
+        'winning_day_rate': (cells > 0).mean(),
+        'median_account_drawdown': account_drawdown.median(),
+        'profitable_accounts': (account_equity.iloc[:, -1] > 0).mean(),
+    }
+
+
+def test_run_matches_pandas_replay():
+    df = make_trades()
+    result = Backtester(df).run(size_scales=SIZE_SCALES, leverage_caps=LEVERAGE_CAPS)
+
+    assert len(result) == len(SIZE_SCALES) * len(LEVERAGE_CAPS)
+    assert result['total_pnl'].is_monotonic_decreasing
+    for row in result.itertuples(index=False):
+        expected = replay(df, row.greed_size_scale, row.fear_leverage_cap)
+        for name, value in expected.items():
+            assert getattr(row, name) == pytest.approx(value, rel=1e-9, abs=1e-6), (row.greed_size_scale, row.fear_leverage_cap, name)
+
+
+def test_blocking_does_not_change_results():
+    backtester = Backtester(make_trades(seed=1))
+    unblocked = backtester.run(size_scales=SIZE_SCALES, leverage_caps=LEVERAGE_CAPS, max_cells=2 ** 24)
+    # Smaller than one (account, day) grid, so every cap and rule gets its own block
+    blocked = backtester.run(size_scales=SIZE_SCALES, leverage_caps=LEVERAGE_CAPS, max_cells=100)
+
+    by_rule = ['greed_size_scale', 'fear_leverage_cap']
+    pd.testing.assert_frame_equal(
+        unblocked.sort_values(by_rule, ignore_index=True),
+        blocked.sort_values(by_rule, ignore_index=True),
+        check_exact=False, rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize('size_scales, leverage_caps', [
+    ([np.nan], [1.0]),
+    ([-3.0], [1.0]),
+    ([np.inf], [1.0]),
+    ([1.0], [np.nan]),
+    ([1.0], [-5.0]),
+    ([1.0], [0.0]),
+    ([], [1.0]),
+])
+def test_run_rejects_invalid_grids(size_scales, leverage_caps):
+    with pytest.raises(ValueError):
+        Backtester(make_trades()).run(size_scales=size_scales, leverage_caps=leverage_caps)
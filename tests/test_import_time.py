@@ -0,0 +1,11 @@
+import pytest
+
+from check_import_time import BUDGET_SECONDS, MODULES, measure
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_cold_import_within_budget(module):
+    elapsed, heavy = measure(module, runs=3)
+
+    assert heavy == [], f"{module} eagerly imports {', '.join(heavy)}"
+    assert elapsed < BUDGET_SECONDS, f"{module} took {elapsed:.2f}s (budget {BUDGET_SECONDS:.2f}s)"
@@ -0,0 +1,39 @@
+import io
+
+import pandas as pd
+import pytest
+
+from src.ingest import UploadLimitError, read_upload
+
+
+def parquet_upload(df, **kwargs):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False, **kwargs)
+    buffer.seek(0)
+    return buffer
+
+
+def test_parquet_round_trip():
+    df = pd.DataFrame({'account': ['a', 'b', 'c'], 'closedPnL': [1.0, -2.0, 3.5]})
+
+    result = read_upload(parquet_upload(df), name='trades.parquet', chunksize=2)
+
+    pd.testing.assert_frame_equal(result, df)
+
+
+def test_parquet_decoded_size_is_limited():
+    # A repeated long string dictionary-encodes to a few KB but decodes to about 10 MB
+    df = pd.DataFrame({'note': ['x' * 1000] * 10_000})
+    upload = parquet_upload(df, compression='zstd')
+    assert len(upload.getvalue()) < 64 * 1024
+
+    with pytest.raises(UploadLimitError):
+        read_upload(upload, name='bomb.parquet', max_bytes=1024 * 1024)
+
+
+def test_parquet_uncompressed_size_is_limited():
+    df = pd.DataFrame({'value': range(200_000)})
+    upload = parquet_upload(df, compression='zstd')
+
+    with pytest.raises(UploadLimitError, match='uncompressed'):
+        read_upload(upload, name='wide.parquet', max_bytes=len(upload.getvalue()) + 1024)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from src.lag_analysis import METRICS, SIGNALS, SentimentLagAnalysis
+
+
+def make_trades(seed=0, n=5000):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2024-01-01', periods=90, freq='D')
+    dates = days[rng.integers(0, len(days), n)]
+    value = pd.Series(rng.integers(5, 95, len(days)), index=days)
+    return pd.DataFrame({
+        'account': rng.choice([f'acct{i}' for i in range(23)], n),
+        'date': dates,
+        'closedPnL': rng.normal(0, 10, n),
+        'leverage': np.where(rng.random(n) < 0.1, np.nan, rng.choice([1.0, 5.0, 10.0], n)),
+        'Value': value[dates].to_numpy(),
+    })
+
+
+def test_metric_matrix_matches_pivot():
+    df = make_trades()
+    analysis = SentimentLagAnalysis(df, max_lag=3)
+    expected = {
+        'pnl': df.pivot_table(index='account', columns='date', values='closedPnL', aggfunc='sum'),
+        'win_rate': df.assign(win=df['closedPnL'] > 0).pivot_table(index='account', columns='date', values='win', aggfunc='mean'),
+        'leverage': df.pivot_table(index='account', columns='date', values='leverage', aggfunc='mean'),
+    }
+
+    for metric in METRICS:
+        # A block in the middle of the account range
+        matrix = analysis._metric_matrix(metric, 5, 17)
+        pivot = expected[metric].reindex(index=analysis.accounts[5:17], columns=analysis.days)
+        assert np.allclose(matrix, pivot.to_numpy(dtype=float), equal_nan=True)
+
+    daily = np.nansum(analysis._metric_matrix('pnl', 0, len(analysis.accounts)), axis=0)
+    assert np.allclose(analysis.aggregate['pnl'], daily)
+
+
+def test_account_blocks_do_not_change_correlations():
+    analysis = SentimentLagAnalysis(make_trades(seed=1), max_lag=4)
+
+    for signal in SIGNALS:
+        for metric in METRICS:
+            whole, whole_n = analysis.account_correlations(signal, metric)
+            # Fewer cells than one account's days, so every account is its own block
+            blocked, blocked_n = analysis.account_correlations(signal, metric, max_cells=10)
+            pd.testing.assert_frame_equal(whole, blocked)
+            assert (whole_n == blocked_n).all()
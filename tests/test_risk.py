@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from src.risk import TRADING_DAYS, compute_risk_features
+
+
+def test_sharpe_counts_inactive_days_as_zero():
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        'account': rng.choice([f'acct{i}' for i in range(30)], n),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        'closedPnL': rng.normal(1, 10, n),
+    })
+    features = compute_risk_features(df)
+
+    for account, trades in df.groupby('account'):
+        daily = trades.groupby('date')['closedPnL'].sum()
+        daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max()), fill_value=0.0)
+        sharpe = daily.mean() / daily.std() * np.sqrt(TRADING_DAYS)
+        sortino = daily.mean() / np.sqrt((np.minimum(daily, 0.0) ** 2).mean()) * np.sqrt(TRADING_DAYS)
+        assert np.isclose(features.loc[account, 'sharpe'], sharpe)
+        assert np.isclose(features.loc[account, 'sortino'], sortino)
+
+
+def test_sparse_trader_is_not_inflated():
+    # Same PnL pattern, but one account trades every day and the other once a week
+    pattern = [10.0, -4.0, 6.0, -2.0, 8.0, -5.0, 7.0, 3.0]
+    days = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(len(pattern)), unit='D')
+    df = pd.DataFrame({
+        'account': ['daily'] * len(pattern) + ['weekly'] * len(pattern),
+        'date': list(days) + list(pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(len(pattern)) * 7, unit='D')),
+        'closedPnL': pattern * 2,
+    })
+    features = compute_risk_features(df)
+
+    assert features.loc['weekly', 'sharpe'] < features.loc['daily', 'sharpe']
+    assert features.loc['weekly', 'sortino'] < features.loc['daily', 'sortino']
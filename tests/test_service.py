@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.service import AnalyticsService
+
+
+def make_service(tmp_path):
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2024-01-01', periods=60, freq='D')
+    pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'),
+        'value': rng.integers(5, 95, len(days)),
+        'classification': rng.choice(['Fear', 'Greed'], len(days)),
+    }).to_csv(tmp_path / 'sentiment.csv', index=False)
+
+    n = 2000
+    pd.DataFrame({
+        'Account': rng.choice(['a', 'b', 'c'], n),
+        'Coin': 'BTC',
+        'Size Tokens': rng.random(n),
+        'Closed PnL': rng.normal(0, 10, n),
+        'Leverage': rng.choice([1.0, 5.0, 10.0], n),
+        'Timestamp': (days[0].value // 10**6 + rng.integers(0, len(days) * 86400 * 1000, n)).astype(float),
+    }).to_csv(tmp_path / 'trades.csv', index=False)
+
+    return AnalyticsService(str(tmp_path / 'sentiment.csv'), str(tmp_path / 'trades.csv'))
+
+
+def get(service, path, query=b''):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(service({'type': 'http', 'method': 'GET', 'path': path, 'query_string': query}, None, send))
+    return messages[0]['status'], json.loads(messages[1]['body'])
+
+
+def test_max_lag_is_validated(tmp_path):
+    service = make_service(tmp_path)
+
+    for query in (b'max_lag=-1', b'max_lag=60', b'max_lag=100000'):
+        status, body = get(service, '/sentiment-lag', query)
+        assert status == 400
+        assert 'max_lag' in body['error']
+
+    status, body = get(service, '/sentiment-lag', b'max_lag=3')
+    assert status == 200
+    assert sorted({row['lag'] for row in body}) == list(range(-3, 4))
+
+
+def test_sensitive_traders_accepts_signal(tmp_path):
+    service = make_service(tmp_path)
+
+    status, body = get(service, '/sensitive-traders', b'signal=value_change&max_lag=2')
+    assert status == 200
+    assert {row['account'] for row in body} <= {'a', 'b', 'c'}
+
+    status, body = get(service, '/sensitive-traders', b'signal=nope')
+    assert status == 400
+
+
+def test_backtest_grids_and_limit_are_validated(tmp_path):
+    service = make_service(tmp_path)
+
+    for query in (
+        b'leverage_caps=nan',
+        b'size_scales=-3&leverage_caps=-5',
+        b'size_scales=inf',
+        b'leverage_caps=0',
+        b'size_scales=' + ','.join(str(i / 100) for i in range(300)).encode() + b'&leverage_caps=' + ','.join(str(i + 1) for i in range(100)).encode(),
+        b'limit=-200',
+    ):
+        status, body = get(service, '/backtest', query)
+        assert status == 400, query
+        assert 'error' in body
+
+    status, body = get(service, '/backtest', b'size_scales=0,1&leverage_caps=2,inf&limit=3')
+    assert status == 200
+    assert len(body) == 3
+    assert all(row['total_pnl'] is not None for row in body)
+
+    status, body = get(service, '/metrics', b'limit=-1')
+    assert status == 400
+
+
+def counting_route(service, path, delay=0.0, size=10):
+    calls = []
+
+    def route(params):
+        calls.append(params)
+        time.sleep(delay)
+        return {'rows': 'x' * size}
+
+    service.routes[path] = route
+    return calls
+
+
+def test_repeated_query_is_served_from_cache(tmp_path):
+    service = make_service(tmp_path)
+    calls = counting_route(service, '/comparison')
+
+    first = get(service, '/comparison', b'a=1&b=2')
+    # Same parameters in a different order map to the same cache entry
+    second = get(service, '/comparison', b'b=2&a=1')
+    assert first == second
+    assert len(calls) == 1
+
+    get(service, '/comparison', b'a=1&b=3')
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded_by_bytes(tmp_path):
+    service = make_service(tmp_path)
+    calls = counting_route(service, '/comparison', size=1000)
+    service.cache_bytes = 2500
+
+    for i in range(5):
+        get(service, '/comparison', f'i={i}'.encode())
+    assert service._cached_bytes <= service.cache_bytes
+    assert len(service._cache) == 2
+
+    # The oldest entries were evicted, the newest are still cached
+    get(service, '/comparison', b'i=4')
+    assert len(calls) == 5
+    get(service, '/comparison', b'i=0')
+    assert len(calls) == 6
+
+
+def test_concurrent_identical_queries_compute_once(tmp_path):
+    service = make_service(tmp_path)
+    calls = counting_route(service, '/comparison', delay=0.2)
+
+    async def run():
+        await service.ensure_loaded()
+        return await asyncio.gather(*(service.query('/comparison', [('a', '1')]) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert len({body for _, body in results}) == 1
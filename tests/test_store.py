@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis import Analyzer
+from src.data_loader import DataLoader
+
+
+def make_data():
+    sentiment = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+        'value': [20, 50, 80],
+        'classification': ['Fear', 'Neutral', 'Greed'],
+    })
+    trades = pd.DataFrame({
+        'Account': ['a', 'a', 'b', 'b', 'a'],
+        'Coin': ['BTC', 'ETH', 'BTC', 'SOL', 'BTC'],
+        'Size Tokens': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'Closed PnL': [10.0, -5.0, 0.0, 7.5, -1.0],
+        'Leverage': [2.0, 5.0, 10.0, 1.0, 20.0],
+        # A raw 'Date' column is used as the time column and sits next to the derived 'date'
+        'Date': pd.to_datetime(['2024-01-01 10:00', '2024-01-01 12:00', '2024-01-02 09:00', '2024-01-03 15:00', '2024-01-03 16:00']),
+    })
+    return sentiment, trades
+
+
+def build(tmp_path):
+    loader = DataLoader(None, None, db_path=str(tmp_path / 'trades.db'))
+    sentiment_df, trades_df, merged_df = loader.preprocess_data(*make_data())
+    return loader.build_store(sentiment_df, trades_df), merged_df
+
+
+def test_build_store_with_date_time_column(tmp_path):
+    store, merged_df = build(tmp_path)
+
+    columns = [row[1] for row in store.conn.execute("PRAGMA table_info(trades)")]
+    assert len({col.lower() for col in columns}) == len(columns)
+    assert 'date' in columns
+
+    history = store.trader_history('a')
+    assert len(history) == 3
+    assert list(history['date'].dt.strftime('%Y-%m-%d')) == ['2024-01-01', '2024-01-01', '2024-01-03']
+
+
+def test_store_metrics_match_pandas(tmp_path):
+    store, merged_df = build(tmp_path)
+
+    expected = Analyzer(merged_df.copy()).calculate_metrics()
+    actual = Analyzer(merged_df.copy(), store=store).calculate_metrics()
+
+    assert list(actual['account']) == list(expected['account'])
+    assert (actual['date'] == expected['date']).all()
+    for col in ['closedPnL', 'win_rate', 'avg_size', 'trade_count', 'avg_leverage']:
+        assert np.allclose(actual[col], expected[col])
+
+
+def test_trades_filters_by_classification_and_range(tmp_path):
+    store, _ = build(tmp_path)
+
+    fear = store.trades(start='2024-01-01', end='2024-01-07', classification='Fear')
+    assert len(fear) == 2
+    assert set(fear['Classification']) == {'Fear'}
+
+
+def test_concurrent_queries_share_the_connection(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    store, _ = build(tmp_path)
+    expected = store.daily_metrics()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: store.daily_metrics(), range(64)))
+
+    for result in results:
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_store_metrics_skip_the_dataframe_pass(tmp_path):
+    store, merged_df = build(tmp_path)
+    df = merged_df.drop(columns=['leverage'])
+
+    Analyzer(df, store=store).calculate_metrics()
+
+    assert 'win' not in df.columns
+    assert 'leverage' not in df.columns